@@ -0,0 +1,48 @@
+import functools
+from datetime import date
+from diskcache import Cache
+
+CACHE_DIR = './.cache'
+
+# Cache lifetimes in seconds
+DAY = 86400
+SOURCE_TTL = DAY
+RDAP_TTLS = {
+    # Batches rotate by day of month, so a domain comes round again after
+    # up to a month. Registrations run for a year or more, so skipping
+    # that recheck is safe
+    'REGISTERED': 31 * DAY,
+    # Available domains are what we alert on, so always recheck them on
+    # the next rotation; this only saves repeat runs on the same day
+    'AVAILABLE': DAY
+}
+
+CACHE = Cache(CACHE_DIR)
+
+def get_domain_status(domain):
+    """Return a cached availability status for a domain, or None"""
+    return CACHE.get(('rdap', domain))
+
+def set_domain_status(domain, status):
+    """Cache a conclusive availability status for a domain"""
+    if status in RDAP_TTLS:
+        CACHE.set(('rdap', domain), status, expire=RDAP_TTLS[status])
+
+def cached_source(name):
+    """Cache a source fetcher's names for the rest of the day"""
+    def decorator(fetch):
+        @functools.wraps(fetch)
+        def wrapper():
+            key = (name, date.today().isoformat())
+            result = CACHE.get(key)
+            if result is not None:
+                print(f'Using cached {name} ({len(result)} names)')
+                return result
+            
+            result = fetch()
+            # Empty results usually mean the fetch failed, so retry next run
+            if result:
+                CACHE.set(key, result, expire=SOURCE_TTL)
+            return result
+        return wrapper
+    return decorator
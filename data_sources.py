@@ -1,22 +1,49 @@
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+from lxml import html
+from cache import cached_source
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+import os
+import pickle
 import sys
+import time
 
+# Collected names change slowly, so reuse them for a week between scrapes
+SNAPSHOT_PATH = Path('sources_snapshot.pkl')
+SNAPSHOT_MAX_AGE = 7 * 86400
+
+# Shared session so repeat requests to the same host reuse pooled connections
+SESSION = requests.Session()
+# Ask for compressed pages; lxml parses the decompressed bytes directly
+SESSION.headers['Accept-Encoding'] = 'gzip, deflate'
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=20,
+    pool_maxsize=50,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 502, 503, 504])
+))
+
+def has_class(name):
+    """XPath predicate matching elements that carry the given CSS class"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+# Second cell of every row in every wikitable
+WIKITABLE_NAME_CELLS = f"//table[{has_class('wikitable')}]//tr/td[2]"
+
+@cached_source('wiki_fg500')
 def fetch_fortune_global_500():
     """Fetch Fortune Global 500 companies from Wikipedia"""
     print('Fetching Fortune Global 500...')
     try:
-        response = requests.get('https://en.wikipedia.org/wiki/Fortune_Global_500', timeout=30)
-        soup = BeautifulSoup(response.text, 'lxml')
+        response = SESSION.get('https://en.wikipedia.org/wiki/Fortune_Global_500', timeout=30)
+        tree = html.fromstring(response.content)
         
         companies = set()
-        for table in soup.find_all('table', class_='wikitable'):
-            for row in table.find_all('tr'):
-                cells = row.find_all('td')
-                if len(cells) > 1:
-                    company_name = cells[1].get_text().strip()
-                    if company_name:
-                        companies.add(company_name)
+        for cell in tree.xpath(WIKITABLE_NAME_CELLS):
+            company_name = cell.text_content().strip()
+            if company_name:
+                companies.add(company_name)
         
         result = list(companies)[:500]
         print(f'  Found {len(result)} Fortune Global 500 companies')
@@ -25,21 +52,19 @@ def fetch_fortune_global_500():
         print(f'  Error fetching Fortune Global 500: {e}', file=sys.stderr)
         return []
 
+@cached_source('wiki_fus500')
 def fetch_fortune_us_500():
     """Fetch Fortune US 500 companies from Wikipedia"""
     print('Fetching Fortune US 500...')
     try:
-        response = requests.get('https://en.wikipedia.org/wiki/Fortune_500', timeout=30)
-        soup = BeautifulSoup(response.text, 'lxml')
+        response = SESSION.get('https://en.wikipedia.org/wiki/Fortune_500', timeout=30)
+        tree = html.fromstring(response.content)
         
         companies = set()
-        for table in soup.find_all('table', class_='wikitable'):
-            for row in table.find_all('tr'):
-                cells = row.find_all('td')
-                if len(cells) > 1:
-                    company_name = cells[1].get_text().strip()
-                    if company_name:
-                        companies.add(company_name)
+        for cell in tree.xpath(WIKITABLE_NAME_CELLS):
+            company_name = cell.text_content().strip()
+            if company_name:
+                companies.add(company_name)
         
         result = list(companies)[:500]
         print(f'  Found {len(result)} Fortune US 500 companies')
@@ -48,22 +73,19 @@ def fetch_fortune_us_500():
         print(f'  Error fetching Fortune US 500: {e}', file=sys.stderr)
         return []
 
+@cached_source('wiki_sp500')
 def fetch_sp500():
     """Fetch S&P 500 companies from Wikipedia"""
     print('Fetching S&P 500...')
     try:
-        response = requests.get('https://en.wikipedia.org/wiki/List_of_S%26P_500_companies', timeout=30)
-        soup = BeautifulSoup(response.text, 'lxml')
+        response = SESSION.get('https://en.wikipedia.org/wiki/List_of_S%26P_500_companies', timeout=30)
+        tree = html.fromstring(response.content)
         
         companies = set()
-        table = soup.find('table', id='constituents')
-        if table:
-            for row in table.find_all('tr'):
-                cells = row.find_all('td')
-                if len(cells) > 1:
-                    company_name = cells[1].get_text().strip()
-                    if company_name:
-                        companies.add(company_name)
+        for cell in tree.xpath("//table[@id='constituents']//tr/td[2]"):
+            company_name = cell.text_content().strip()
+            if company_name:
+                companies.add(company_name)
         
         result = list(companies)
         print(f'  Found {len(result)} S&P 500 companies')
@@ -72,21 +94,19 @@ def fetch_sp500():
         print(f'  Error fetching S&P 500: {e}', file=sys.stderr)
         return []
 
+@cached_source('wiki_unicorns')
 def fetch_unicorns():
     """Fetch Unicorn startups from Wikipedia"""
     print('Fetching Unicorn startups...')
     try:
-        response = requests.get('https://en.wikipedia.org/wiki/List_of_unicorn_startup_companies', timeout=30)
-        soup = BeautifulSoup(response.text, 'lxml')
+        response = SESSION.get('https://en.wikipedia.org/wiki/List_of_unicorn_startup_companies', timeout=30)
+        tree = html.fromstring(response.content)
         
         companies = set()
-        for table in soup.find_all('table', class_='wikitable'):
-            for row in table.find_all('tr'):
-                cells = row.find_all('td')
-                if len(cells) > 0:
-                    company_name = cells[0].get_text().strip()
-                    if company_name and len(company_name) < 50:
-                        companies.add(company_name)
+        for cell in tree.xpath(f"//table[{has_class('wikitable')}]//tr/td[1]"):
+            company_name = cell.text_content().strip()
+            if company_name and len(company_name) < 50:
+                companies.add(company_name)
         
         result = list(companies)
         print(f'  Found {len(result)} Unicorn startups')
@@ -102,33 +122,34 @@ def fetch_yc_companies():
         companies = set()
         
         # Try main YC directory
-        response = requests.get('https://www.ycombinator.com/companies', timeout=30)
-        soup = BeautifulSoup(response.text, 'lxml')
+        response = SESSION.get('https://www.ycombinator.com/companies', timeout=30)
+        tree = html.fromstring(response.content)
         
         # Try multiple selectors
-        for link in soup.find_all('a', href=True):
-            if '/companies/' in link['href']:
-                name = link.get_text().strip()
-                if name and 2 < len(name) < 50 and 'http' not in name:
-                    companies.add(name)
+        for link in tree.xpath("//a[contains(@href, '/companies/')]"):
+            name = link.text_content().strip()
+            if name and 2 < len(name) < 50 and 'http' not in name:
+                companies.add(name)
         
-        for div in soup.find_all('div', class_=lambda x: x and 'company' in x.lower()):
+        company_divs = tree.xpath(
+            "//div[contains(translate(@class, 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'company')]"
+        )
+        for div in company_divs:
             for tag in ['h3', 'h4']:
-                elem = div.find(tag)
-                if elem:
-                    name = elem.get_text().strip()
+                elem = div.find(f'.//{tag}')
+                if elem is not None:
+                    name = elem.text_content().strip()
                     if name and 2 < len(name) < 50:
                         companies.add(name)
         
         # Try top companies
         try:
-            top_response = requests.get('https://www.ycombinator.com/topcompanies', timeout=30)
-            top_soup = BeautifulSoup(top_response.text, 'lxml')
-            for link in top_soup.find_all('a', href=True):
-                if '/companies/' in link['href']:
-                    name = link.get_text().strip()
-                    if name and 2 < len(name) < 50 and 'http' not in name:
-                        companies.add(name)
+            top_response = SESSION.get('https://www.ycombinator.com/topcompanies', timeout=30)
+            top_tree = html.fromstring(top_response.content)
+            for link in top_tree.xpath("//a[contains(@href, '/companies/')]"):
+                name = link.text_content().strip()
+                if name and 2 < len(name) < 50 and 'http' not in name:
+                    companies.add(name)
         except:
             pass
         
@@ -143,11 +164,11 @@ def fetch_github_trending():
     """Fetch GitHub Trending repositories"""
     print('Fetching GitHub Trending...')
     try:
-        response = requests.get('https://github.com/trending', timeout=30)
-        soup = BeautifulSoup(response.text, 'lxml')
+        response = SESSION.get('https://github.com/trending', timeout=30)
+        tree = html.fromstring(response.content)
         
         companies = set()
-        for link in soup.select('h2.h3 a'):
+        for link in tree.xpath(f"//h2[{has_class('h3')}]//a"):
             href = link.get('href', '')
             if href:
                 parts = href.split('/')
@@ -176,16 +197,70 @@ def get_custom_buzzwords():
         'Starlink'
     ]
 
+def load_snapshot():
+    """Load the saved source names if the snapshot is recent enough"""
+    if not SNAPSHOT_PATH.exists():
+        return None
+    
+    try:
+        age = time.time() - SNAPSHOT_PATH.stat().st_mtime
+        if age >= SNAPSHOT_MAX_AGE:
+            return None
+        
+        names = pickle.loads(SNAPSHOT_PATH.read_bytes())
+    except Exception as e:
+        # A corrupt pickle can raise almost anything; fall back to scraping
+        # rather than failing the whole run
+        print(f'Ignoring unreadable sources snapshot: {e}', file=sys.stderr)
+        return None
+    
+    if not isinstance(names, list) or not all(isinstance(name, str) for name in names):
+        print('Ignoring sources snapshot that is not a list of names', file=sys.stderr)
+        return None
+    
+    return names
+
+def save_snapshot(names):
+    """Save source names, replacing any previous snapshot atomically"""
+    temp_path = SNAPSHOT_PATH.with_name(SNAPSHOT_PATH.name + '.tmp')
+    try:
+        temp_path.write_bytes(pickle.dumps(names))
+        os.replace(temp_path, SNAPSHOT_PATH)
+        print(f'Saved sources snapshot to {SNAPSHOT_PATH}')
+    except OSError as e:
+        print(f'Failed to save sources snapshot: {e}', file=sys.stderr)
+
 def fetch_all_sources():
     """Fetch all data sources"""
     print('\n=== Fetching All Data Sources ===\n')
     
-    fortune_global = fetch_fortune_global_500()
-    fortune_us = fetch_fortune_us_500()
-    sp500 = fetch_sp500()
-    unicorns = fetch_unicorns()
-    yc_companies = fetch_yc_companies()
-    github_trending = fetch_github_trending()
+    snapshot = load_snapshot()
+    if snapshot is not None:
+        print(f'Using sources snapshot from {SNAPSHOT_PATH} ({len(snapshot)} names)')
+        return snapshot
+    
+    fetchers = {
+        'fortune_global': fetch_fortune_global_500,
+        'fortune_us': fetch_fortune_us_500,
+        'sp500': fetch_sp500,
+        'unicorns': fetch_unicorns,
+        'yc_companies': fetch_yc_companies,
+        'github_trending': fetch_github_trending
+    }
+    
+    # Sources are independent, so fetch them all at once
+    results = {}
+    with ThreadPoolExecutor(max_workers=len(fetchers)) as executor:
+        futures = {executor.submit(fetch): name for name, fetch in fetchers.items()}
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+    
+    fortune_global = results['fortune_global']
+    fortune_us = results['fortune_us']
+    sp500 = results['sp500']
+    unicorns = results['unicorns']
+    yc_companies = results['yc_companies']
+    github_trending = results['github_trending']
     buzzwords = get_custom_buzzwords()
     
     all_names = (
@@ -208,4 +283,9 @@ def fetch_all_sources():
     print(f'Custom Buzzwords: {len(buzzwords)}')
     print(f'Total (before deduplication): {len(all_names)}')
     
+    # Only keep a snapshot when every source came back, so a failed
+    # scrape is retried on the next run instead of being reused all week
+    if all(results.values()):
+        save_snapshot(all_names)
+    
     return all_names
@@ -1,41 +1,38 @@
-import re
+import string
 from datetime import datetime
 from data_sources import fetch_all_sources
 
 AFFIXES = ['ai', 'labs', 'cloud', 'tech']
 
+# ASCII bytes that are not allowed in a normalized name
+_DISALLOWED_BYTES = bytes(
+    c for c in range(128)
+    if chr(c) not in string.ascii_lowercase + string.digits
+)
+
 def normalize_name(name):
     """Normalize company name to domain-safe format"""
-    return re.sub(r'[^a-z0-9]', '', name.lower())[:25]
+    # Dropping non-ASCII on encode, then deleting the remaining disallowed
+    # bytes, keeps exactly [a-z0-9] without a per-character regex
+    return name.lower().encode('ascii', 'ignore').translate(None, _DISALLOWED_BYTES).decode('ascii')[:25]
 
 def is_valid_name(name):
     """Check if name is valid for domain generation"""
     return 3 <= len(name) <= 25
 
-def generate_variations(base_name):
-    """Generate domain variations from a base name"""
-    variations = set()
-    clean_name = normalize_name(base_name)
-    
-    if not is_valid_name(clean_name):
-        return []
-    
-    # Add base name
-    variations.add(clean_name)
-    
-    # Add suffix variations
-    for affix in AFFIXES:
-        with_suffix = f"{clean_name}{affix}"
-        if len(with_suffix) <= 25:
-            variations.add(with_suffix)
-    
-    # Add prefix variations
-    for affix in AFFIXES:
-        with_prefix = f"{affix}{clean_name}"
-        if len(with_prefix) <= 25:
-            variations.add(with_prefix)
-    
-    return list(variations)
+def generate_variations(clean_name):
+    """Generate domain variations from an already normalized, valid name"""
+    # Only affixes that keep the result within 25 characters
+    max_affix_len = 25 - len(clean_name)
+    affixes = [affix for affix in AFFIXES if len(affix) <= max_affix_len]
+    
+    # Base name, then suffix and prefix variations
+    # (callers deduplicate across names, so no set is needed here)
+    variations = [clean_name]
+    variations.extend(clean_name + affix for affix in affixes)
+    variations.extend(affix + clean_name for affix in affixes)
+    
+    return variations
 
 def process_all_keywords():
     """Process all names: deduplicate, normalize, and generate variations"""
@@ -49,10 +46,8 @@ def process_all_keywords():
     print(f'\nAfter deduplication: {len(unique_names)} unique names')
     
     # Normalize and filter
-    normalized_names = [normalize_name(name) for name in unique_names]
-    normalized_names = [name for name in normalized_names if is_valid_name(name)]
-    
-    unique_normalized = list(set(normalized_names))
+    normalized_names = {normalize_name(name) for name in unique_names}
+    unique_normalized = [name for name in normalized_names if is_valid_name(name)]
     print(f'After normalization and filtering: {len(unique_normalized)} valid names')
     
     # Generate all variations
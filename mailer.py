@@ -4,6 +4,13 @@ from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime
 
+# CSS class for each domain status badge
+STATUS_CLASSES = {
+    'AVAILABLE': 'status-available',
+    'POSSIBLE_AVAILABLE': 'status-possible',
+    'REGISTERED': 'status-registered'
+}
+
 def send_email(base_count, available_count, possible_count, interesting_groups):
     """Send email notification with available domains"""
     email_user = os.environ.get('EMAIL_USER')
@@ -16,29 +23,31 @@ def send_email(base_count, available_count, possible_count, interesting_groups):
     groups_array = list(interesting_groups.items())[:30]  # Limit to first 30 groups
     more_count = len(interesting_groups) - 30 if len(interesting_groups) > 30 else 0
     
-    # Build text version
-    text_content = f"Domain Hunter has found {base_count} interesting base name{'s' if base_count != 1 else ''} with available or possibly available domains!\n\n"
-    text_content += "Summary:\n"
-    text_content += f"  • Available: {available_count}\n"
-    text_content += f"  • Possible Available: {possible_count}\n"
-    text_content += f"  • Interesting base names: {base_count}\n\n"
-    text_content += "Domains:\n\n"
+    # Build text version (collect parts and join once)
+    text_parts = [
+        f"Domain Hunter has found {base_count} interesting base name{'s' if base_count != 1 else ''} with available or possibly available domains!\n\n",
+        "Summary:\n",
+        f"  • Available: {available_count}\n",
+        f"  • Possible Available: {possible_count}\n",
+        f"  • Interesting base names: {base_count}\n\n",
+        "Domains:\n\n"
+    ]
     
     for base, results in groups_array:
-        text_content += f"{base}:\n"
-        for r in results:
-            text_content += f"  {r['domain']}: {r['status']}\n"
-        text_content += "\n"
+        text_parts.append(f"{base}:\n")
+        text_parts.extend(f"  {r['domain']}: {r['status']}\n" for r in results)
+        text_parts.append("\n")
     
     if more_count > 0:
-        text_content += f"\n... and {more_count} more base names (see results.csv)\n"
+        text_parts.append(f"\n... and {more_count} more base names (see results.csv)\n")
     
-    text_content += f"\nRun Time: {datetime.now().isoformat()}\n\n"
-    text_content += "---\nThis is an automated message from Domain Hunter.\n"
-    text_content += "Check the GitHub Actions run for full details and results.csv file.\n"
+    text_parts.append(f"\nRun Time: {datetime.now().isoformat()}\n\n")
+    text_parts.append("---\nThis is an automated message from Domain Hunter.\n")
+    text_parts.append("Check the GitHub Actions run for full details and results.csv file.\n")
+    text_content = ''.join(text_parts)
     
-    # Build HTML version
-    html_content = f"""
+    # Build HTML version (collect parts and join once)
+    html_parts = [f"""
 <!DOCTYPE html>
 <html>
 <head>
@@ -89,35 +98,33 @@ def send_email(base_count, available_count, possible_count, interesting_groups):
     
     <div class="content">
       <h2>Interesting Domains:</h2>
-"""
+"""]
     
     for base, results in groups_array:
-        html_content += f"""
+        html_parts.append(f"""
       <div class="domain-group">
         <h3>{base}</h3>
-"""
+""")
         for r in results:
-            status_class = ('status-available' if r['status'] == 'AVAILABLE' else
-                          'status-possible' if r['status'] == 'POSSIBLE_AVAILABLE' else
-                          'status-registered')
-            html_content += f"""
+            status_class = STATUS_CLASSES.get(r['status'], 'status-registered')
+            html_parts.append(f"""
         <div class="domain-item">
           <span class="domain-name">{r['domain']}</span>
           <span class="status {status_class}">{r['status']}</span>
         </div>
-"""
-        html_content += """
+""")
+        html_parts.append("""
       </div>
-"""
+""")
     
     if more_count > 0:
-        html_content += f"""
+        html_parts.append(f"""
       <p style="margin-top: 20px; color: #666; text-align: center;">
         <em>... and {more_count} more base names (see results.csv)</em>
       </p>
-"""
+""")
     
-    html_content += f"""
+    html_parts.append(f"""
       <p style="margin-top: 20px;"><strong>Run Time:</strong> {datetime.now().isoformat()}</p>
     </div>
     
@@ -128,7 +135,8 @@ def send_email(base_count, available_count, possible_count, interesting_groups):
   </div>
 </body>
 </html>
-"""
+""")
+    html_content = ''.join(html_parts)
     
     # Email subject
     subject = f"🎯 Domain Hunter: {base_count} Interesting Domain{'s' if base_count != 1 else ''} Found ({available_count} Available)"
@@ -3,67 +3,119 @@ import time
 import csv
 import sys
 import asyncio
+from collections import Counter, deque
+import dns.asyncresolver
 import dns.resolver
 from datetime import datetime
 from keywords import get_todays_batch
 from mailer import send_email
-import requests
+from cache import get_domain_status, set_domain_status
+import aiohttp
 
 TLDS = ['.com', '.app', '.ai', '.so']
-CONCURRENCY = 2
-DELAY_MS = 1200
+CONCURRENCY = 20
+CONCURRENCY_PER_HOST = 5
+PENDING_CHECKS = 2 * CONCURRENCY  # Checks scheduled at once; extra slack keeps the semaphore busy
+DELAY_MS = 300  # Minimum spacing between RDAP requests for the same TLD
+RDAP_DELAY_MS = 500  # Minimum spacing between any two requests to rdap.org
+RETRY_AFTER_DEFAULT = 5  # Seconds to wait on a 429 without a usable Retry-After
+RETRY_AFTER_MAX = 60
 
 # Status constants
 STATUS_AVAILABLE = 'AVAILABLE'
 STATUS_REGISTERED = 'REGISTERED'
 STATUS_POSSIBLE_AVAILABLE = 'POSSIBLE_AVAILABLE'
 
-def check_rdap(domain):
-    """Check domain availability via RDAP"""
+class RateLimiter:
+    """Space out requests so at most one starts every `interval` seconds (and the parent's, if any)"""
+    
+    def __init__(self, interval, parent=None):
+        self.interval = interval
+        self.parent = parent
+        self.next_slot = 0.0
+    
+    async def acquire(self):
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        slot = max(now, self.next_slot)
+        self.next_slot = slot + self.interval
+        await asyncio.sleep(slot - now)
+        
+        # Also respect the shared limit, e.g. all TLDs going through one host
+        if self.parent is not None:
+            await self.parent.acquire()
+
+def retry_after_seconds(value):
+    """Parse a Retry-After header in seconds, falling back to a default"""
+    try:
+        return min(max(float(value), 0.0), RETRY_AFTER_MAX)
+    except (TypeError, ValueError):
+        # Missing, or given as an HTTP date
+        return RETRY_AFTER_DEFAULT
+
+class RdapThrottled(Exception):
+    """rdap.org answered 429; `delay` is how long it asked us to wait"""
+    
+    def __init__(self, delay):
+        super().__init__(f'throttled for {delay:.0f}s')
+        self.delay = delay
+
+async def check_rdap(session, domain):
+    """Check domain availability via RDAP (raises RdapThrottled on HTTP 429)"""
     try:
-        response = requests.get(
+        async with session.get(
             f'https://rdap.org/domain/{domain}',
             headers={'Accept': 'application/rdap+json'},
-            timeout=10
-        )
-        
-        # 404 = domain not found = available
-        if response.status_code == 404:
-            return STATUS_AVAILABLE
-        
-        # 200 = domain found = registered
-        if response.status_code == 200:
-            data = response.json()
+            timeout=aiohttp.ClientTimeout(total=10)
+        ) as response:
+            # 429 = throttled, let the caller wait and retry within the rate limits
+            if response.status == 429:
+                raise RdapThrottled(retry_after_seconds(response.headers.get('Retry-After')))
             
-            # Check if domain has status indicating it's registered
-            if 'status' in data and isinstance(data['status'], list):
-                has_active = any(
-                    'active' in s.lower() or 'ok' in s.lower()
-                    for s in data['status']
-                )
-                if has_active:
-                    return STATUS_REGISTERED
+            # 404 = domain not found = available
+            if response.status == 404:
+                return STATUS_AVAILABLE
             
-            # If we have entities or nameservers, it's registered
-            if 'entities' in data or 'nameservers' in data:
-                return STATUS_REGISTERED
+            # Other status codes are unclear
+            if response.status != 200:
+                return None
             
-            # Otherwise unclear
-            return None
+            # 200 = domain found = registered
+            # RDAP servers reply with application/rdap+json, so skip the content type check
+            data = await response.json(content_type=None)
+        
+        # Check if domain has status indicating it's registered
+        if 'status' in data and isinstance(data['status'], list):
+            has_active = any(
+                'active' in s.lower() or 'ok' in s.lower()
+                for s in data['status']
+            )
+            if has_active:
+                return STATUS_REGISTERED
         
-        # Other status codes are unclear
+        # If we have entities or nameservers, it's registered
+        if 'entities' in data or 'nameservers' in data:
+            return STATUS_REGISTERED
+        
+        # Otherwise unclear
         return None
+    except RdapThrottled:
+        raise
     except Exception:
         # Network errors or timeouts
         return None
 
-def check_dns(domain):
+def create_resolver():
+    """Create the async DNS resolver shared by all fallback lookups"""
+    resolver = dns.asyncresolver.Resolver()
+    resolver.timeout = 5
+    resolver.lifetime = 5
+    return resolver
+
+async def check_dns(resolver, domain):
     """Check domain availability via DNS NS lookup (fallback)"""
     try:
-        resolver = dns.resolver.Resolver()
-        resolver.timeout = 5
-        resolver.lifetime = 5
-        nameservers = resolver.resolve(domain, 'NS')
+        nameservers = await resolver.resolve(domain, 'NS')
         # If we get nameservers, domain is registered
         return STATUS_REGISTERED if nameservers else STATUS_AVAILABLE
     except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer):
@@ -73,17 +125,44 @@ def check_dns(domain):
         # Other errors are unclear
         return None
 
-def check_domain(domain):
+async def check_rdap_limited(session, semaphore, limiter, domain):
+    """Run one RDAP check inside the concurrency and rate limits"""
+    async with semaphore:
+        # Wait for our turn with this TLD's registry (and rdap.org overall)
+        await limiter.acquire()
+        print(f'Checking: {domain}')
+        return await check_rdap(session, domain)
+
+async def check_domain(session, resolver, semaphore, limiter, domain):
     """Check domain availability with RDAP + DNS fallback"""
-    print(f'Checking: {domain}')
+    # Reuse a recent answer if we have one
+    status = get_domain_status(domain)
+    if status is not None:
+        print(f'  {domain}: {status} (cached)')
+        return {
+            'domain': domain,
+            'status': status
+        }
     
-    # Try RDAP first
-    status = check_rdap(domain)
+    # Try RDAP first, retrying once if rdap.org throttles us
+    try:
+        status = await check_rdap_limited(session, semaphore, limiter, domain)
+    except RdapThrottled as throttled:
+        print(f'  RDAP throttled, retrying {domain} in {throttled.delay:.0f}s')
+        # Wait without holding a concurrency slot; the retry then queues
+        # for the per-TLD and rdap.org rate limits like any other request
+        await asyncio.sleep(throttled.delay)
+        try:
+            status = await check_rdap_limited(session, semaphore, limiter, domain)
+        except RdapThrottled:
+            status = None
+    set_domain_status(domain, status)
     
     # If RDAP is unclear, try DNS
     if status is None:
         print(f'  RDAP unclear, trying DNS for {domain}')
-        status = check_dns(domain)
+        async with semaphore:
+            status = await check_dns(resolver, domain)
     
     # If still unclear, mark as POSSIBLE_AVAILABLE
     if status is None:
@@ -91,9 +170,6 @@ def check_domain(domain):
     
     print(f'  {domain}: {status}')
     
-    # Add delay to respect rate limits
-    time.sleep(DELAY_MS / 1000.0)
-    
     return {
         'domain': domain,
         'status': status
@@ -113,45 +189,93 @@ def generate_domains(keywords):
     
     return domains
 
-def group_by_base(results):
-    """Group results by base name"""
-    grouped = {}
+class ResultStream:
+    """Tally results as they arrive and write interesting groups to CSV straight away"""
     
-    for result in results:
-        base = result['base']
-        if base not in grouped:
-            grouped[base] = []
-        grouped[base].append(result)
+    def __init__(self, filename):
+        self.filename = filename
+        self.file = None
+        self.writer = None
+        self.total = 0
+        self.counts = Counter()
+        self.interesting = {}
+        self.current_base = None
+        self.current_results = []
     
-    return grouped
-
-def filter_interesting_groups(grouped):
-    """Filter groups to include only those with at least one non-REGISTERED domain"""
-    interesting = {}
+    def add(self, result):
+        # Results arrive in domain_list order, so a base name's group is
+        # complete as soon as the next base name starts
+        if result['base'] != self.current_base:
+            self.finish_group()
+            self.current_base = result['base']
+        
+        self.total += 1
+        self.counts[result['status']] += 1
+        self.current_results.append(result)
     
-    for base, results in grouped.items():
-        has_non_registered = any(r['status'] != STATUS_REGISTERED for r in results)
-        if has_non_registered:
-            interesting[base] = results
+    def finish_group(self):
+        """Keep and write the current group if it has at least one non-REGISTERED domain"""
+        base, results = self.current_base, self.current_results
+        self.current_base, self.current_results = None, []
+        
+        if any(r['status'] != STATUS_REGISTERED for r in results):
+            self.interesting[base] = results
+            self.write_rows([base, r['domain'], r['status']] for r in results)
     
-    return interesting
-
-def process_domains_sequential(domain_list):
-    """Process domains sequentially with rate limiting"""
-    results = []
+    def write_rows(self, rows):
+        # Open lazily so runs with nothing interesting leave no CSV behind
+        if self.file is None:
+            self.file = open(self.filename, 'w', newline='')
+            self.writer = csv.writer(self.file)
+            self.writer.writerow(['base', 'domain', 'status'])
+        
+        self.writer.writerows(rows)
+        # Flush per group so rows survive a crash mid-run
+        self.file.flush()
     
-    for item in domain_list:
-        result = check_domain(item['domain'])
-        result['base'] = item['base']
-        results.append(result)
+    def close(self):
+        self.finish_group()
+        if self.file is not None:
+            self.file.close()
+
+async def check_item(session, resolver, semaphore, limiters, item):
+    """Check a single generated domain and tag the result with its base name"""
+    result = await check_domain(session, resolver, semaphore, limiters[item['tld']], item['domain'])
+    result['base'] = item['base']
+    return result
+
+async def process_domains_async(domain_list, on_result):
+    """Process domains concurrently with per-TLD rate limiting, passing results to on_result in order"""
+    resolver = create_resolver()
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+    # Every lookup goes through rdap.org, so the per-TLD limits share one overall limit
+    rdap_limiter = RateLimiter(RDAP_DELAY_MS / 1000.0)
+    limiters = {tld: RateLimiter(DELAY_MS / 1000.0, parent=rdap_limiter) for tld in TLDS}
+    connector = aiohttp.TCPConnector(
+        limit=50,
+        limit_per_host=CONCURRENCY_PER_HOST,
+        ttl_dns_cache=300
+    )
     
-    return results
+    async with aiohttp.ClientSession(connector=connector) as session:
+        # Keep a bounded window of scheduled checks and hand results over in
+        # input order, so each result is released once on_result has it
+        pending = deque()
+        for item in domain_list:
+            pending.append(asyncio.ensure_future(
+                check_item(session, resolver, semaphore, limiters, item)
+            ))
+            if len(pending) >= PENDING_CHECKS:
+                on_result(await pending.popleft())
+        
+        while pending:
+            on_result(await pending.popleft())
 
 def main():
     print('=== Domain Hunter Started ===')
     print(f'Time: {datetime.now().isoformat()}')
-    print(f'Concurrency: {CONCURRENCY}')
-    print(f'Delay: {DELAY_MS}ms')
+    print(f'Concurrency: {CONCURRENCY} ({CONCURRENCY_PER_HOST} per host)')
+    print(f'Delay per TLD: {DELAY_MS}ms ({RDAP_DELAY_MS}ms overall)')
     print('')
     
     # Get today's batch of keywords
@@ -166,27 +290,28 @@ def main():
     print(f'\nTotal domains to check: {len(domain_list)}')
     print('')
     
-    # Check all domains (sequential for simplicity and rate limiting)
+    # Check all domains concurrently, rate limited per TLD, writing
+    # interesting groups (at least one non-REGISTERED) to CSV as they complete
+    filename = 'results.csv'
+    stream = ResultStream(filename)
     start_time = time.time()
-    results = process_domains_sequential(domain_list)
+    try:
+        asyncio.run(process_domains_async(domain_list, stream.add))
+    finally:
+        stream.close()
     
     end_time = time.time()
     duration = (end_time - start_time) / 60
     
-    # Group by base name
-    grouped = group_by_base(results)
-    
-    # Filter to only interesting groups (at least one non-REGISTERED)
-    interesting = filter_interesting_groups(grouped)
-    
-    # Count statistics
-    total_available = sum(1 for r in results if r['status'] == STATUS_AVAILABLE)
-    total_possible = sum(1 for r in results if r['status'] == STATUS_POSSIBLE_AVAILABLE)
-    total_registered = sum(1 for r in results if r['status'] == STATUS_REGISTERED)
+    counts = stream.counts
+    interesting = stream.interesting
+    total_available = counts[STATUS_AVAILABLE]
+    total_possible = counts[STATUS_POSSIBLE_AVAILABLE]
+    total_registered = counts[STATUS_REGISTERED]
     
     print('')
     print('=== Results Summary ===')
-    print(f'Total domains checked: {len(results)}')
+    print(f'Total domains checked: {stream.total}')
     print(f'Available: {total_available}')
     print(f'Possible Available: {total_possible}')
     print(f'Registered: {total_registered}')
@@ -194,25 +319,15 @@ def main():
     print(f'Duration: {duration:.2f} minutes')
     print('')
     
-    # Only write CSV if we found interesting results
+    # CSV is only written if we found interesting results
     if len(interesting) > 0:
         print('=== Interesting Domains ===\n')
         
-        # Build CSV
-        csv_rows = []
-        
         for base, domain_results in interesting.items():
             print(f'{base}:')
             for result in domain_results:
                 print(f'  {result["domain"]}: {result["status"]}')
-                csv_rows.append([base, result['domain'], result['status']])
         
-        # Write CSV
-        filename = 'results.csv'
-        with open(filename, 'w', newline='') as f:
-            writer = csv.writer(f)
-            writer.writerow(['base', 'domain', 'status'])
-            writer.writerows(csv_rows)
         print(f'\nResults written to {filename}')
         
         # Send email notification